@@ -0,0 +1,34 @@
+"""build_kernels.py
+
+AOT-сборка численных ядер (procedures/_kernels.py) в нативный модуль
+procedures/stats_kernels (.so/.pyd) через numba.pycc.
+
+Зачем:
+- С @njit(cache=True) первый запуск на новой машине (или после обновления
+  numba) тратит сотни миллисекунд на JIT-компиляцию ядер.
+- Собранный заранее модуль импортируется как обычное расширение —
+  без JIT при старте run_verification.py.
+
+Запуск (один раз после установки / обновления numba или numpy):
+    python build_kernels.py
+
+Нужен numba и C-компилятор. Без собранного модуля всё работает как раньше:
+_kernels использует @njit, а без numba — NumPy.
+"""
+
+from pathlib import Path
+
+from numba.pycc import CC
+
+from procedures import _kernels
+
+cc = CC("stats_kernels")
+cc.output_dir = str(Path(__file__).resolve().parent / "procedures")
+
+# Исходники ядер — те же Python-функции, что в _kernels оборачиваются в @njit;
+# сигнатуры фиксированы: одномерные массивы float64.
+cc.export("mean_std", "UniTuple(f8, 2)(f8[:])")(_kernels._mean_std)
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"built stats_kernels -> {cc.output_dir}")
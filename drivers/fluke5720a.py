@@ -12,7 +12,7 @@ from __future__ import annotations
 Команды соответствуют справочнику Remote Programming Reference Guide.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 from .visa_base import VisaInstrument, VisaConfig
 
@@ -31,12 +31,21 @@ class Fluke5720A:
 команды собраны в одном месте и легко правятся.
 """
     visa: VisaInstrument
+    # кэш ответа *IDN? (заполняется при первом успешном запросе)
+    _idn: Optional[str] = field(default=None, init=False, repr=False)
 
     @classmethod
     def open(cls, resource: str, cfg: VisaConfig) -> "Fluke5720A":
         return cls(VisaInstrument(resource, cfg))
 
     def reset(self) -> None:
+        # 57xx принимает цепочку команд через ';' — одна транзакция GPIB.
+        try:
+            self.visa.write("*RST;*CLS;STBY")
+            return
+        except Exception:
+            pass
+        # fallback: по одной команде
         try:
             self.visa.write("*RST")
         except Exception:
@@ -52,14 +61,16 @@ class Fluke5720A:
             pass
 
     def idn(self) -> str:
-        for cmd in ("*IDN?", "IDN?", "ID?"):
-            try:
-                s=self.visa.query(cmd).strip()
-                if s:
-                    return s
-            except Exception:
-                continue
-        return ""
+        if self._idn is not None:
+            return self._idn
+        # *IDN? — штатная команда идентификации 5720A.
+        try:
+            s = self.visa.query("*IDN?").strip()
+        except Exception:
+            s = ""
+        if s:
+            self._idn = s
+        return s
 
     def standby(self) -> None:
         self.visa.write("STBY")
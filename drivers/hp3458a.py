@@ -9,57 +9,40 @@ from __future__ import annotations
 
 - конфигурация: PRESET NORM, DCV/DCI, NDIG 8, RANGE, NPLC, AZERO, HIZ
 - измерение: TRIG SGL -> read() -> парсинг числа
+- серия: NRDGS n + TARM SGL -> n раз read() (burst)
 
-Также реализован автоподбор фиксированных диапазонов DCV/DCI (минимально достаточный).
+Также реализован автоподбор фиксированных диапазонов DCV/DCI (минимально достаточный);
+сами диапазоны описаны в procedures/tables_section18 (без зависимости от PyVISA).
 """
 
 
-from dataclasses import dataclass
-from typing import Optional
+from array import array
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Final, Optional
 import re
-import time
-
-from .visa_base import VisaInstrument, VisaConfig
-
-def _map_dcv_range(v_abs: float) -> float:
-    """Map requested DCV range/value to one of: 0.120, 1.2, 12, 120, 1050 V."""
-    v = abs(float(v_abs))
-    if v <= 0.120:
-        return 0.120
-    if v <= 1.2:
-        return 1.2
-    if v <= 12.0:
-        return 12.0
-    if v <= 120.0:
-        return 120.0
-    return 1050.0
-
-def _map_dci_range(i_abs: float) -> float:
-    """Map requested DCI range/value to one of:
-    120 nA, 1.2 uA, 12 uA, 120 uA, 1.2 mA, 12 mA, 120 mA, 1.05 A (returned in amperes).
-    """
-    i = abs(float(i_abs))
-    if i <= 120e-9:
-        return 120e-9
-    if i <= 1.2e-6:
-        return 1.2e-6
-    if i <= 12e-6:
-        return 12e-6
-    if i <= 120e-6:
-        return 120e-6
-    if i <= 1.2e-3:
-        return 1.2e-3
-    if i <= 12e-3:
-        return 12e-3
-    if i <= 120e-3:
-        return 120e-3
-    return 1.05
-
-_NUM_RE = re.compile(r"[-+]?\d+(?:\.\d*)?(?:[Ee][-+]?\d+)?")
+
+from procedures.tables_section18 import map_dcv_range, map_dci_range
+
+from .visa_base import VisaInstrument, VisaConfig, VisaBatch
+
+# Готовые команды для флагов AutoZero/HiZ (индекс — bool: [False], [True]).
+# HiZ=True означает FIXEDZ OFF (высокий входной импеданс на 0.1–10 V).
+_AZERO: Final = ("AZERO OFF", "AZERO ON")
+_FIXEDZ: Final = ("FIXEDZ ON", "FIXEDZ OFF")
+
+# Компилируется один раз; search() сам пропускает пробелы/CR/LF вокруг числа.
+_NUM_RE: Final = re.compile(r"[-+]?\d+(?:\.\d*)?(?:[Ee][-+]?\d+)?")
+_NUM_SEARCH: Final = _NUM_RE.search  # привязанный метод: без поиска атрибута на каждый отсчёт
 
 def _parse_first_float(s: str) -> float:
-    s = s.strip().replace("\r", "").replace("\n", "")
-    m = _NUM_RE.search(s)
+    # Быстрый путь: обычный ответ 3458A — одно число ("+1.234567E-03\r\n");
+    # float() сам игнорирует пробелы/CR/LF по краям. Regex — только для "грязных" ответов.
+    try:
+        return float(s)
+    except ValueError:
+        pass
+    m = _NUM_SEARCH(s)
     if not m:
         raise ValueError(f"3458A: cannot parse numeric from: {s!r}")
     return float(m.group(0))
@@ -76,6 +59,8 @@ class HP3458A:
     This avoids 3458A incompatibilities with READ?/FETCH? on some setups.
     """
     visa: VisaInstrument
+    # кэш ответа ID? (заполняется при первом успешном запросе)
+    _idn: Optional[str] = field(default=None, init=False, repr=False)
 
     @classmethod
     def open(cls, resource: str, cfg: VisaConfig) -> "HP3458A":
@@ -95,20 +80,29 @@ class HP3458A:
         return self.visa.query(cmd)
 
     def _read_text(self) -> str:
-        return self.visa.inst.read()
+        return self.visa.read()
 
     # ---- identification / reset ----
     def idn(self) -> str:
-        for cmd in ("ID?", "IDN?"):
-            try:
-                s = self.query(cmd).strip()
-                if s:
-                    return s
-            except Exception:
-                pass
+        if self._idn is not None:
+            return self._idn
+        # ID? — штатная команда идентификации 3458A.
+        try:
+            s = self.query("ID?").strip()
+        except Exception:
+            s = ""
+        if s:
+            self._idn = s
+            return s
         return "HP3458A"
 
     def reset(self) -> None:
+        # 3458A принимает несколько команд через ';' — одна транзакция GPIB вместо трёх.
+        try:
+            self.write("PRESET NORM;END ALWAYS;AZERO ON")
+            return
+        except Exception:
+            pass
         self.write("PRESET NORM")
         try:
             self.write("END ALWAYS")
@@ -131,48 +125,96 @@ class HP3458A:
         self.write(f"NPLC {nplc}")
 
     def _autozero(self, on: bool) -> None:
-        self.write(f"AZERO {'ON' if on else 'OFF'}")
+        self.write(_AZERO[bool(on)])
 
     def _hiz(self, on: bool) -> None:
         try:
-            self.write(f"FIXEDZ {'OFF' if on else 'ON'}")
+            self.write(_FIXEDZ[bool(on)])
         except Exception:
             pass
 
     # ---- configuration like your screenshots ----
-    def conf_function_DCV(self, mrange: Optional[float] = None, nplc: float = 100,
-                          AutoZero: bool = True, HiZ: bool = True, channel: int = 1) -> None:
+    def _conf_function(self, func: str, mrange: Optional[float], nplc: float,
+                       AutoZero: bool, HiZ: bool, batch: Optional[VisaBatch] = None) -> None:
+        """Сконфигурировать функцию одной составной командой (через ';').
+
+        Если адаптер/прибор не принял составную строку — повторяем построчно,
+        как раньше (PRESET NORM в начале сбрасывает частично применённое).
+        Если передан batch — команда только ставится в очередь (отправит batch.submit()).
+        """
+        range_cmd = "ARANGE ON" if mrange is None else f"RANGE {mrange}"
+        cmd = (f"PRESET NORM;{func};NDIG 8;TRIG SGL;{range_cmd};NPLC {nplc};"
+               f"{_AZERO[bool(AutoZero)]};{_FIXEDZ[bool(HiZ)]}")
+        if batch is not None:
+            batch.write(cmd)
+            return
+        try:
+            self.write(cmd)
+            return
+        except Exception:
+            pass
         self.write("PRESET NORM")
-        self.write("DCV")
+        self.write(func)
         self.write("NDIG 8")
         self.write("TRIG SGL")
         self._set_range_and_nplc(mrange, nplc)
         self._autozero(AutoZero)
         self._hiz(HiZ)
 
+    def conf_function_DCV(self, mrange: Optional[float] = None, nplc: float = 100,
+                          AutoZero: bool = True, HiZ: bool = True, channel: int = 1,
+                          batch: Optional[VisaBatch] = None) -> None:
+        self._conf_function("DCV", mrange, nplc, AutoZero, HiZ, batch)
+
     def conf_function_DCI(self, mrange: Optional[float] = None, nplc: float = 100,
-                          AutoZero: bool = True, HiZ: bool = True, channel: int = 1) -> None:
-        self.write("PRESET NORM")
-        self.write("DCI")
-        self.write("NDIG 8")
-        self.write("TRIG SGL")
-        self._set_range_and_nplc(mrange, nplc)
-        self._autozero(AutoZero)
-        self._hiz(HiZ)
+                          AutoZero: bool = True, HiZ: bool = True, channel: int = 1,
+                          batch: Optional[VisaBatch] = None) -> None:
+        self._conf_function("DCI", mrange, nplc, AutoZero, HiZ, batch)
 
     # ---- read ----
     def get_reading(self, channel: Optional[int] = None) -> float:
-        self.write("TRIG SGL")
-        time.sleep(0.02)
-        s = self._read_text()
+        # Без фиксированной паузы: read() блокируется до готовности отсчёта
+        # (ограничено VISA timeout), что верно при любом NPLC.
+        # Триггер и чтение — одна транзакция (lock прибора).
+        with self.visa.lock:
+            self.write("TRIG SGL")
+            s = self._read_text()
         return _parse_first_float(s)
 
+    def burst(self, n: int, nplc: Optional[float] = None, delay_s: float = 0.0) -> array:
+        """Серия из n отсчётов одним запуском внутреннего триггера 3458A.
+
+        Вместо n пар TRIG SGL/read: NRDGS n,TIMER (интервал delay_s) или NRDGS n,AUTO,
+        затем TARM SGL — прибор сам снимает серию, клиент только вычитывает отсчёты.
+        Функция/диапазон должны быть уже настроены (config_dcv/config_dci).
+
+        Отсчёты серии передаются в двоичном виде (OFORMAT DREAL: 8 байт IEEE-754,
+        big-endian, без заголовка) одним чтением n*8 байт — без разбора текста.
+        Результат — array('d'): непрерывный буфер double (8 байт на отсчёт),
+        который NumPy принимает без копирования (np.frombuffer).
+        После серии формат возвращается в ASCII, триггер — в режим одиночных
+        отсчётов (как после conf_function_*).
+        """
+        sample = f"TIMER;TIMER {delay_s}" if delay_s > 0 else "AUTO"
+        nplc_cmd = f"NPLC {nplc};" if nplc is not None else ""
+        with self.visa.lock:
+            self.write(f"{nplc_cmd}OFORMAT DREAL;TARM HOLD;TRIG AUTO;NRDGS {n},{sample}")
+            try:
+                return self.visa.query_binary_values(
+                    "TARM SGL", datatype="d", is_big_endian=True, header_fmt="empty",
+                    data_points=n, expect_termination=False, container=partial(array, "d"))
+            finally:
+                try:
+                    self.write("OFORMAT ASCII;TARM AUTO;TRIG HOLD;NRDGS 1,AUTO")
+                except Exception:
+                    pass
+
     # Compatibility with project procedures:
     def config_dcv(self, rng_v: float, nplc: float = 10.0) -> None:
-        self.conf_function_DCV(mrange=_map_dcv_range(rng_v), nplc=nplc, AutoZero=True, HiZ=True)
+        self.conf_function_DCV(mrange=map_dcv_range(rng_v), nplc=nplc, AutoZero=True, HiZ=True)
 
     def config_dci(self, rng_a: float, nplc: float = 10.0) -> None:
-        self.conf_function_DCI(mrange=_map_dci_range(rng_a), nplc=nplc, AutoZero=True, HiZ=False)
+        self.conf_function_DCI(mrange=map_dci_range(rng_a), nplc=nplc, AutoZero=True, HiZ=False)
 
     def read(self) -> float:
         return self.get_reading()
@@ -9,21 +9,40 @@ from __future__ import annotations
 - output(on/off)
 - source_v(), source_i()
 - измерение read() (парсит первую величину из ответа :READ?)
+- серия burst(n) (n отсчётов одним :READ? через TRIG:COUN)
 
 Примечание: 6430 по :READ? часто возвращает несколько полей через запятую.
 Драйвер берёт первое поле как основное измеренное значение.
 """
 
-from dataclasses import dataclass
+from array import array
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
 from typing import Literal, Optional
-from .visa_base import VisaInstrument, VisaConfig
+from .visa_base import VisaInstrument, VisaConfig, VisaBatch
 import time
 
 Func = Literal["VOLT", "CURR", "RES"]
 
+# Готовые команды для часто переключаемых состояний (индекс — bool: [False], [True]).
+_OUTP = (":OUTP OFF", ":OUTP ON")
+
+@lru_cache(maxsize=256)
+def _source_cmd(func: str, value: float, rng: Optional[float]) -> str:
+    """Составная команда источника: функция, диапазон (если rng задан), значение.
+
+    Кэш живёт в пределах одного процесса: повторы дают совпадающие точки
+    таблиц 18-3/18-4 и 18-5/18-6 (одни и те же значения и диапазоны).
+    """
+    rng_cmd = f":SOUR:{func}:RANG {rng};" if rng is not None else ""
+    return f":SOUR:FUNC {func};{rng_cmd}:SOUR:{func} {value}"
+
 @dataclass
 class K6430:
     visa: VisaInstrument
+    # последний запрограммированный диапазон источника (None — неизвестен, напр. после *RST)
+    _v_range: Optional[float] = field(default=None, init=False, repr=False)
+    _i_range: Optional[float] = field(default=None, init=False, repr=False)
 
     @classmethod
     def open(cls, resource: str, cfg: VisaConfig) -> "K6430":
@@ -32,25 +51,52 @@ class K6430:
     def reset(self) -> None:
         self.visa.write("*RST")
         self.visa.write("*CLS")
+        self._v_range = None
+        self._i_range = None
 
     def idn(self) -> str:
         return self.visa.query("*IDN?").strip()
 
     def output(self, on: bool) -> None:
-        self.visa.write(f":OUTP {'ON' if on else 'OFF'}")
+        self.visa.write(_OUTP[bool(on)])
 
     # --- Source configuration ---
-    def source_v(self, value_v: float, rng: Optional[float]=None) -> None:
-        self.visa.write(":SOUR:FUNC VOLT")
-        if rng is not None:
-            self.visa.write(f":SOUR:VOLT:RANG {rng}")
-        self.visa.write(f":SOUR:VOLT {value_v}")
-
-    def source_i(self, value_a: float, rng: Optional[float]=None) -> None:
-        self.visa.write(":SOUR:FUNC CURR")
-        if rng is not None:
-            self.visa.write(f":SOUR:CURR:RANG {rng}")
-        self.visa.write(f":SOUR:CURR {value_a}")
+    # batch: если передан VisaBatch, команды ставятся в очередь (отправит batch.submit()).
+    # Возвращают True, если диапазон источника был перепрограммирован (переходный
+    # процесс переключения диапазона — нужна полная пауза стабилизации).
+    # Команда RANG не отправляется, если запрошен тот же диапазон, что и в прошлый раз.
+    # FUNC/RANG/значение уходят одной составной командой (_source_cmd).
+    def source_v(self, value_v: float, rng: Optional[float]=None,
+                 batch: Optional[VisaBatch]=None) -> bool:
+        changed = rng is not None and rng != self._v_range
+        self._send_source(_source_cmd("VOLT", value_v, rng if changed else None),
+                          "_v_range", rng if changed else None, batch)
+        return changed
+
+    def source_i(self, value_a: float, rng: Optional[float]=None,
+                 batch: Optional[VisaBatch]=None) -> bool:
+        changed = rng is not None and rng != self._i_range
+        self._send_source(_source_cmd("CURR", value_a, rng if changed else None),
+                          "_i_range", rng if changed else None, batch)
+        return changed
+
+    def _send_source(self, cmd: str, attr: str, new_rng: Optional[float],
+                     batch: Optional[VisaBatch]) -> None:
+        """Отправить команду источника; кэш диапазона (attr) обновить только когда
+        команда реально ушла: сразу после write() или после batch.submit()."""
+        if batch is not None:
+            batch.write(cmd)
+            if new_rng is not None:
+                batch.on_submit(partial(setattr, self, attr, new_rng))
+            return
+        try:
+            self.visa.write(cmd)
+        except BaseException:
+            # дошла ли команда до прибора — неизвестно: RANG пошлём заново
+            setattr(self, attr, None)
+            raise
+        if new_rng is not None:
+            setattr(self, attr, new_rng)
 
     def source_v_query(self) -> float:
         return float(self.visa.query(":SOUR:VOLT?"))
@@ -59,14 +105,21 @@ class K6430:
         return float(self.visa.query(":SOUR:CURR?"))
 
     # --- Measure configuration ---
+    def _wait_opc(self) -> None:
+        """Дождаться завершения предыдущей команды (*OPC?); без поддержки — пауза 0.5 с."""
+        try:
+            self.visa.query("*OPC?")
+        except Exception:
+            time.sleep(0.5)
+
     def sense_func(self, func: Func) -> None:
         if func == "VOLT":
             self.visa.write(":SENS:FUNC:ON 'VOLT'")
-            time.sleep(0.5)
+            self._wait_opc()
             self.visa.write(":FUNC:OFF 'CURR'")
         elif func == "CURR":
             self.visa.write(":SENS:FUNC:ON 'CURR'")
-            time.sleep(0.5)
+            self._wait_opc()
             self.visa.write(":FUNC:OFF 'VOLT'")
         elif func == "RES":
             self.visa.write(":SENS:FUNC:ON 'RES'")
@@ -86,10 +139,33 @@ class K6430:
     def read(self) -> float:
         # Single reading using READ?
         s = self.visa.query(":READ?")
-        return float(s.split(",")[0])
+        # partition: берём только первое поле, не разбивая весь ответ на список.
+        head, _, _ = s.partition(",")
+        return float(head)
+
+    def burst(self, n: int, delay_s: float = 0.0) -> array:
+        """Серия из n отсчётов одним :READ? (TRIG:COUN n, пауза TRIG:DEL).
+
+        Ответ содержит n групп полей; из каждой берётся первое поле (как в read()).
+        Результат — array('d') (непрерывный буфер double, см. HP3458A.burst).
+        После серии TRIG:COUN/TRIG:DEL возвращаются к значениям после *RST (1 и 0).
+        """
+        with self.visa.lock:
+            self.visa.write(f":TRIG:COUN {n};:TRIG:DEL {delay_s}")
+            try:
+                fields = self.visa.query(":READ?").split(",")
+            finally:
+                try:
+                    self.visa.write(":TRIG:COUN 1;:TRIG:DEL 0")
+                except Exception:
+                    pass
+        step = max(len(fields) // n, 1)
+        return array("d", map(float, fields[::step][:n]))
 
     def fetch(self) -> float:
-        return float(self.visa.query(":FETC?"))
+        # :FETC? возвращает те же поля, что и :READ?
+        head, _, _ = self.visa.query(":FETC?").partition(",")
+        return float(head)
 
     def close(self) -> None:
         self.visa.close()
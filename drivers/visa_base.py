@@ -8,6 +8,9 @@ from __future__ import annotations
 - В одном месте описать, как проект открывает GPIB/USB/LAN ресурсы через PyVISA.
 - Спрятать детали ResourceManager (backend) и таймаутов.
 - Дать единый объект (VisaInstrument), который остальные драйверы используют для write/query/read.
+- Дать VisaBatch — очередь команд, отправляемых одной транзакцией.
+- Сериализовать обмен с каждым прибором (VisaInstrument.lock): процедуры опрашивают
+  приборы из нескольких потоков (section18._pool).
 
 Важные термины:
 - *resource* — VISA-строка ресурса, например: "GPIB0::23::INSTR".
@@ -18,9 +21,30 @@ from __future__ import annotations
 """
 
 from dataclasses import dataclass
+from typing import Callable, Dict, List
+import threading
+
 import pyvisa
 
 
+# Минимальный размер блока чтения (байт), см. VisaInstrument.__init__.
+READ_CHUNK_SIZE = 4096
+
+# Один ResourceManager на backend: 3458A/5720A/6430 открываются вместе,
+# и повторная инициализация backend (поиск библиотек и т.п.) не нужна.
+_RM_CACHE: Dict[str, pyvisa.ResourceManager] = {}
+
+
+def _resource_manager(backend: str) -> pyvisa.ResourceManager:
+    """Вернуть (и при необходимости создать) ResourceManager для backend."""
+    key = backend or ""
+    rm = _RM_CACHE.get(key)
+    if rm is None:
+        rm = pyvisa.ResourceManager(backend) if backend else pyvisa.ResourceManager()
+        _RM_CACHE[key] = rm
+    return rm
+
+
 @dataclass
 class VisaConfig:
     """Параметры подключения к VISA.
@@ -51,14 +75,20 @@ class VisaInstrument:
     В проекте:
     - Каждый конкретный драйвер (K6430/HP3458A/Fluke5720A) хранит у себя поле `visa: VisaInstrument`.
     - Это упрощает тестирование и безопасное выключение в finally.
+
+    Потоки: write/query/read выполняются под lock (RLock) этого прибора —
+    две операции с одной VISA-сессией не пересекаются. Обмен из нескольких
+    шагов (команда + чтение ответа) драйвер оборачивает в `with inst.lock:`.
+    Разные приборы друг друга не блокируют.
     """
 
     def __init__(self, resource: str, cfg: VisaConfig):
-        # ResourceManager — "фабрика" для открытия ресурсов.
-        rm = pyvisa.ResourceManager(cfg.backend) if cfg.backend else pyvisa.ResourceManager()
+        # ResourceManager — "фабрика" для открытия ресурсов (общий для всех приборов с этим backend).
+        rm = _resource_manager(cfg.backend)
 
         # Открываем сам ресурс (например, GPIB адрес).
         self.inst = rm.open_resource(resource)
+        self.lock = threading.RLock()
 
         # Таймауты для операций чтения/запросов.
         self.inst.timeout = cfg.timeout_ms
@@ -71,13 +101,34 @@ class VisaInstrument:
         except Exception:
             pass
 
+        # Размер блока чтения: ответ прибора (~20 байт) должен приходить за один
+        # вызов драйвера, а не по частям. Значение по умолчанию PyVISA не уменьшаем.
+        # Если у ресурса нет chunk_size (не message-based) — оставляем как есть.
+        try:
+            if self.inst.chunk_size < READ_CHUNK_SIZE:
+                self.inst.chunk_size = READ_CHUNK_SIZE
+        except Exception:
+            pass
+
     def write(self, cmd: str) -> None:
         """Отправить команду прибору (без ожидания ответа)."""
-        self.inst.write(cmd)
+        with self.lock:
+            self.inst.write(cmd)
 
     def query(self, cmd: str) -> str:
         """Отправить команду и прочитать ответ одной строкой."""
-        return self.inst.query(cmd)
+        with self.lock:
+            return self.inst.query(cmd)
+
+    def read(self) -> str:
+        """Прочитать одну строку ответа (после ранее отправленной команды)."""
+        with self.lock:
+            return self.inst.read()
+
+    def query_binary_values(self, cmd: str, **kwargs):
+        """Отправить команду и прочитать двоичный блок (см. pyvisa query_binary_values)."""
+        with self.lock:
+            return self.inst.query_binary_values(cmd, **kwargs)
 
     def close(self) -> None:
         """Закрыть VISA-сессию (best-effort)."""
@@ -85,3 +136,67 @@ class VisaInstrument:
             self.inst.close()
         except Exception:
             pass
+
+
+class VisaBatch:
+    """Очередь команд для одного прибора с отправкой одной строкой.
+
+    write() только накапливает команды, submit() отправляет их одной
+    VISA-транзакцией через ';' (прибор должен поддерживать составные команды:
+    3458A, 5720A и SCPI-приборы с абсолютными путями ":SOUR:..." — да).
+
+    Использование:
+        batch = VisaBatch(k.visa)
+        k.source_v(1.0, rng=2.0, batch=batch)
+        batch.submit()
+
+    или как контекстный менеджер (submit() при выходе без исключения):
+        with VisaBatch(k.visa) as batch:
+            k.source_v(1.0, rng=2.0, batch=batch)
+
+    Чтения (query/read) не батчатся — они остаются синхронными.
+
+    Драйвер, который кэширует состояние прибора (например, диапазон 6430),
+    регистрирует обновление кэша через on_submit(): оно выполняется только
+    после успешной отправки; при ошибке или выходе по исключению очередь
+    и эти обновления отбрасываются вместе.
+    """
+
+    def __init__(self, inst: VisaInstrument):
+        self.inst = inst
+        self.buf: List[str] = []
+        self._on_submit: List[Callable[[], None]] = []
+
+    def write(self, cmd: str) -> None:
+        """Поставить команду в очередь (без обращения к прибору)."""
+        self.buf.append(cmd)
+
+    def on_submit(self, fn: Callable[[], None]) -> None:
+        """Выполнить fn() после успешной отправки очереди (не при отбрасывании)."""
+        self._on_submit.append(fn)
+
+    def discard(self) -> None:
+        """Отбросить очередь и отложенные обновления без отправки."""
+        self.buf.clear()
+        self._on_submit.clear()
+
+    def submit(self) -> None:
+        """Отправить накопленные команды одной строкой и очистить очередь."""
+        if not self.buf:
+            self._on_submit.clear()
+            return
+        try:
+            self.inst.write(";".join(self.buf))
+            for fn in self._on_submit:
+                fn()
+        finally:
+            self.discard()
+
+    def __enter__(self) -> "VisaBatch":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.submit()
+        else:
+            self.discard()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+"""procedures._kernels
+
+Числовое ядро, которое вызывается на каждой серии отсчётов:
+- mean_std: среднее и выборочное СКО (N-1) серии за один проход (Уэлфорд).
+
+Лимиты (closest value) и PASS/FAIL считаются скалярно по точке
+(tables_section18.shift_limits, common.within): точка пишется в CSV сразу
+после измерения, а вызов numba на одно значение дороже самой арифметики.
+
+Откуда берётся ядро (KERNELS):
+- "aot"   — собранный заранее модуль procedures/stats_kernels (build_kernels.py),
+            без JIT при старте;
+- "jit"   — numba @njit (кэш на диске — повторные запуски не платят за JIT);
+- "numpy" — numba не установлен: те же исходники без компиляции
+            (mean_std — тот же цикл Уэлфорда, результат совпадает с "jit"/"aot").
+
+fastmath не используется: перестановка операций меняет последние разряды
+результатов, а они пишутся в протокол поверки.
+"""
+
+import numpy as np
+
+
+# --- исходники ядер (общие для AOT-сборки и @njit) ---
+
+def _mean_std(x: np.ndarray) -> tuple[float, float]:
+    """Среднее и выборочное СКО (N-1) одним проходом (алгоритм Уэлфорда).
+
+    Отсчёты сдвигаются на первый (x - x[0]): у серий вида 10 V ± 1 nV
+    иначе теряются разряды СКО.
+    Пустая серия -> (NaN, 0.0); одна точка -> СКО 0.0.
+    """
+    n = x.size
+    if n == 0:
+        return np.nan, 0.0
+    k = x[0]
+    m = 0.0
+    m2 = 0.0
+    for i in range(n):
+        y = x[i] - k
+        d = y - m
+        m += d / (i + 1)
+        m2 += d * (y - m)
+    if n < 2:
+        return k + m, 0.0
+    return k + m, np.sqrt(m2 / (n - 1))
+
+
+try:
+    from .stats_kernels import mean_std
+    KERNELS = "aot"
+except ImportError:
+    try:
+        from numba import njit
+    except ImportError:  # numba необязателен
+        mean_std = _mean_std
+        KERNELS = "numpy"
+    else:
+        mean_std = njit(cache=True, error_model="numpy")(_mean_std)
+        KERNELS = "jit"
@@ -5,9 +5,10 @@ from __future__ import annotations
 Общие утилиты и структуры данных для процедур раздела 18.
 
 Этот файл делает две вещи:
-1) Дает простые математические функции (mean/stdev) и проверки (within).
-2) Описывает структуру результата измерения `PointResult`, которая потом
-   конвертируется в таблицу (pandas.DataFrame) и сохраняется в CSV.
+1) Дает простые математические функции (mean/stdev/mean_stdev), проверки (within)
+   и подсказки оператору (prompt/prompt_checklist).
+2) Описывает структуру результата измерения `PointResult`, которая
+   пишется в CSV построчно (CsvResultWriter) или конвертируется в pandas.DataFrame.
 
 Почему PointResult важен:
 - Каждая "точка" из таблиц Section 18 превращается в одну строку CSV.
@@ -16,10 +17,15 @@ from __future__ import annotations
 - Для трассируемости low-current точек добавлены r_key/r_nom_ohm/r_act_ohm.
 """
 
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, fields
+from typing import TYPE_CHECKING, IO, List, Tuple
+import csv
 import math
-import pandas as pd
+import operator
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
 
 
 def mean(xs: List[float]) -> float:
@@ -34,8 +40,11 @@ def mean(xs: List[float]) -> float:
     -------
     float
         Среднее значение. Если список пустой — NaN.
+
+    Сумма считается через math.fsum (точное суммирование), чтобы округление
+    не накапливалось в последних разрядах на длинных сериях.
     """
-    return sum(xs) / len(xs) if xs else float("nan")
+    return math.fsum(xs) / len(xs) if len(xs) else float("nan")
 
 
 def stdev(xs: List[float]) -> float:
@@ -47,15 +56,55 @@ def stdev(xs: List[float]) -> float:
 
     Если точек меньше 2 — возвращаем 0.0.
     """
-    if len(xs) < 2:
-        return 0.0
-    m = mean(xs)
-    return math.sqrt(sum((x - m) ** 2 for x in xs) / (len(xs) - 1))
+    return mean_stdev(xs)[1]
+
+
+def mean_stdev(xs: List[float] | np.ndarray) -> Tuple[float, float]:
+    """Среднее и выборочное СКО (N-1) одной функцией.
+
+    В процедурах для каждой серии нужны оба значения, поэтому считаем их
+    вместе: сумма квадратов отклонений — одним проходом Уэлфорда, а среднее
+    возвращается точное, через math.fsum (как в mean()).
+
+    Для серии в виде np.ndarray (см. section18._sample_readings) СКО считает
+    ядро _kernels.mean_std (один и тот же алгоритм при любом backend), а
+    среднее — тоже math.fsum: записанное значение не зависит от того,
+    установлен ли numba.
+
+    Returns
+    -------
+    (mean, stdev)
+        Для пустого списка mean = NaN; если точек меньше 2 — stdev = 0.0.
+    """
+    if not isinstance(xs, (list, tuple)):
+        # NumPy и _kernels (numba) импортируются лениво: списки считаются
+        # на чистом Python, и импорт common не платит за них при старте.
+        import numpy as np
+        from ._kernels import mean_std
+
+        x = np.ascontiguousarray(xs, dtype=np.float64)
+        if not x.size:
+            return float("nan"), 0.0
+        _, sd = mean_std(x)
+        return math.fsum(x) / x.size, float(sd)
+    n = 0
+    m = 0.0
+    m2 = 0.0
+    k = xs[0] if xs else 0.0  # сдвиг на первый отсчёт: не теряем разряды СКО
+    for x in xs:
+        n += 1
+        y = x - k
+        d = y - m
+        m += d / n
+        m2 += d * (y - m)
+    if not n:
+        return float("nan"), 0.0
+    return math.fsum(xs) / n, math.sqrt(m2 / (n - 1)) if n > 1 else 0.0
 
 
 def within(x: float, lo: float, hi: float) -> bool:
     """Проверка попадания x в интервал [lo, hi]."""
-    return (x >= lo) and (x <= hi)
+    return lo <= x <= hi
 
 
 def prompt(msg: str) -> None:
@@ -63,12 +112,25 @@ def prompt(msg: str) -> None:
 
     Процедура Section 18 содержит ручные шаги (переключение кабелей, подключение 5156 и т.п.).
     Этот helper делает одинаковое поведение по всему проекту.
+
+    Текст подсказки передаётся в input() целиком — одна запись в stdout,
+    без перемешивания с выводом из других потоков.
+    """
+    input("\n" + msg + "\nНажми Enter чтобы продолжить...")
+
+
+def prompt_checklist(msg: str, items: List[str]) -> None:
+    """Показать оператору весь список ручных шагов теста и ждать одно Enter.
+
+    Используется там, где по ходу таблицы нужно несколько переключений
+    (например, резисторы 5156): оператор видит план целиком заранее,
+    а по ходу теста подтверждает только реальные смены подключения.
     """
-    print("\n" + msg)
-    input("Нажми Enter чтобы продолжить...")
+    lines = "\n".join(f"  {i}. {item}" for i, item in enumerate(items, 1))
+    prompt(msg + "\n" + lines)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PointResult:
     """Результат одной проверки (одна строка CSV).
 
@@ -120,6 +182,9 @@ class PointResult:
         Номинал сопротивления из таблицы (например 100e9).
     r_act_ohm:
         Действительное (characterized) значение из YAML, используемое в расчёте I = V/R.
+
+    slots=True: у экземпляров нет __dict__ (меньше памяти на точку, быстрее getattr).
+    frozen=True: результат точки после создания не меняется (пишется в CSV как есть).
     """
 
     # required fields (без default)
@@ -142,6 +207,11 @@ class PointResult:
     r_act_ohm: float | None = None
 
 
+# Имена колонок CSV (порядок полей PointResult), вычисляются один раз.
+_FIELDS = tuple(f.name for f in fields(PointResult))
+_ROW_GETTER = operator.attrgetter(*_FIELDS)
+
+
 def to_dataframe(results: List[PointResult]) -> pd.DataFrame:
     """Преобразовать список результатов в pandas.DataFrame.
 
@@ -149,6 +219,46 @@ def to_dataframe(results: List[PointResult]) -> pd.DataFrame:
         df = to_dataframe(results)
         df.to_csv(...)
 
-    Важно: мы используем __dict__, поэтому новые поля автоматически появляются в CSV.
+    Важно: колонки берутся из dataclasses.fields(PointResult), поэтому новые поля
+    автоматически появляются в CSV (в порядке объявления).
+
+    Строки извлекаются одним attrgetter в кортежи (без промежуточного dict на точку)
+    и передаются в DataFrame.from_records.
     """
-    return pd.DataFrame([r.__dict__ for r in results])
+    # pandas импортируется лениво: он нужен только при сохранении CSV,
+    # а импорт занимает сотни миллисекунд.
+    import pandas as pd
+
+    rows = [_ROW_GETTER(r) for r in results]
+    return pd.DataFrame.from_records(rows, columns=list(_FIELDS))
+
+
+def _csv_cell(v):
+    """Значение ячейки CSV: None/NaN -> пусто (как pandas.to_csv)."""
+    if v is None or (isinstance(v, float) and math.isnan(v)):
+        return ""
+    return v
+
+
+class CsvResultWriter:
+    """Потоковая запись PointResult в CSV: одна строка на точку, сразу на диск.
+
+    Использование:
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = CsvResultWriter(f)
+            verify_...(..., on_point=writer)
+
+    Колонки и их порядок те же, что в to_dataframe(); при Ctrl+C/ошибке
+    уже снятые точки остаются в файле.
+    """
+
+    def __init__(self, f: IO[str]):
+        self._f = f
+        # "\n", как у прежнего DataFrame.to_csv (csv.writer по умолчанию пишет "\r\n")
+        self._w = csv.writer(f, lineterminator="\n")
+        self._w.writerow(_FIELDS)
+        self._f.flush()
+
+    def __call__(self, r: PointResult) -> None:
+        self._w.writerow([_csv_cell(v) for v in _ROW_GETTER(r)])
+        self._f.flush()
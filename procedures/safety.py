@@ -13,8 +13,51 @@ from __future__ import annotations
 - Всегда пытаться выключить выходы/перевести в standby.
 - Всегда пытаться закрыть VISA-сессии.
 - Любые ошибки при shutdown подавляются (best-effort), чтобы shutdown не ломал завершение.
+- Команды выключения идут с коротким VISA timeout: зависший прибор не должен
+  задерживать shutdown на полный timeout_ms (15 с) на каждом шаге.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+# Timeout (мс) для best-effort команд выключения.
+SHUTDOWN_TIMEOUT_MS = 500
+
+
+def _with_timeout(inst, ms: int, fn) -> None:
+    """Вызвать fn() с временно уменьшенным VISA timeout прибора inst.
+
+    inst — драйвер с полем visa (VisaInstrument). Исходный timeout восстанавливается
+    в finally. Если timeout недоступен — fn() вызывается как есть.
+    """
+    try:
+        res = inst.visa.inst
+        old = res.timeout
+    except Exception:
+        fn()
+        return
+    try:
+        res.timeout = ms
+        fn()
+    finally:
+        try:
+            res.timeout = old
+        except Exception:
+            pass
+
+
+def _safe_close(name: str, inst) -> Optional[str]:
+    """Закрыть VISA-сессию прибора, подавляя ошибки.
+
+    Возвращает name, если сессия закрыта (None — ошибка). Печатает вызывающий:
+    _safe_close работает в потоках пула, и print оттуда перемешивает строки.
+    """
+    try:
+        inst.close()
+        return name
+    except Exception:
+        return None
+
 
 def safe_shutdown(k=None, dmm=None, src=None) -> None:
     """Best-effort safe shutdown.
@@ -32,29 +75,31 @@ def safe_shutdown(k=None, dmm=None, src=None) -> None:
     - Если объект существует, вызываем "безопасные" методы:
         - 6430: output(False)
         - 5720A: standby()
-    - Затем закрываем VISA-сессии (close()).
+      (с timeout SHUTDOWN_TIMEOUT_MS, см. _with_timeout)
+    - Затем закрываем VISA-сессии (close()) — параллельно, по потоку на прибор.
     """
     print("\n--- SAFE SHUTDOWN START ---")
     try:
         if k is not None:
             try:
-                k.output(False)
+                _with_timeout(k, SHUTDOWN_TIMEOUT_MS, lambda: k.output(False))
                 print("6430 -> OUTPUT OFF")
             except Exception:
                 pass
         if src is not None:
             try:
-                src.standby()
+                _with_timeout(src, SHUTDOWN_TIMEOUT_MS, src.standby)
                 print("5720A -> STBY")
             except Exception:
                 pass
     finally:
-        for name, inst in (("3458A", dmm), ("5720A", src), ("6430", k)):
-            if inst is None:
-                continue
-            try:
-                inst.close()
-                print(f"{name} -> CLOSE")
-            except Exception:
-                pass
+        # Сессии независимы — закрываем параллельно (время = max, а не сумма).
+        to_close = [(name, inst) for name, inst in (("3458A", dmm), ("5720A", src), ("6430", k))
+                    if inst is not None]
+        if to_close:
+            with ThreadPoolExecutor(max_workers=len(to_close)) as ex:
+                closed = list(ex.map(lambda p: _safe_close(*p), to_close))
+            for name in closed:
+                if name is not None:
+                    print(f"{name} -> CLOSE")
     print("--- SAFE SHUTDOWN DONE ---")
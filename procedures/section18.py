@@ -6,18 +6,23 @@ from __future__ import annotations
 
 Содержит:
 - ProcCfg: параметры измерений (NPLC, задержки, число отсчётов)
-- _sample_readings(): снятие серии измерений
-- shift_limits(): алгоритм "closest value" (сдвиг лимитов)
+- _sample_readings()/_dmm_readings()/_dut_readings(): снятие серии измерений
 - verify_*(): функции, соответствующие таблицам раздела 18
 
 Функции verify_* выводят оператору подсказки по подключению и выполняют измерения.
-Результат каждой точки записывается как PointResult (см. procedures.common).
+Результат каждой точки записывается как PointResult (см. procedures.common)
+и, если передан on_point, сразу отдаётся в него (потоковая запись CSV).
 """
 
+from concurrent.futures import ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from functools import partial
+from itertools import groupby
+from typing import Callable, List, Optional, Dict, Any, Tuple
 import time
 
+import numpy as np
+
 from drivers.k6430 import K6430
 from drivers.hp3458a import HP3458A
 from drivers.fluke5720a import Fluke5720A
@@ -40,7 +45,7 @@ from .tables_section18 import (
     TABLE_18_15_PREAMP_MEAS_R_HIGH,
     TABLE_18_16_PREAMP_MEAS_R_T,
 )
-from .common import PointResult, mean, stdev, within, prompt
+from .common import PointResult, mean_stdev, within, prompt, prompt_checklist
 
 @dataclass
 class ProcCfg:
@@ -49,230 +54,342 @@ class ProcCfg:
     samples_per_point: int
     sample_delay_s: float
     use_5720a_as_voltage_source: bool
+    # True: серия отсчётов одним запуском прибора (HP3458A.burst / K6430.burst);
+    # False: поштучно read() + sample_delay_s (для адаптеров, где burst не работает).
+    burst: bool = True
+    # Пауза стабилизации, если диапазон источника 6430 не менялся (None -> settle_s).
+    settle_s_same_range: Optional[float] = None
+
+def _settle(cfg: ProcCfg, range_changed: bool = True) -> None:
+    """Пауза стабилизации после установки значения источника."""
+    if range_changed or cfg.settle_s_same_range is None:
+        time.sleep(cfg.settle_s)
+    else:
+        time.sleep(cfg.settle_s_same_range)
 
-def _sample_readings(read_fn, n: int, delay_s: float) -> list[float]:
-    xs=[]
-    for _ in range(n):
-        xs.append(float(read_fn()))
-        time.sleep(delay_s)
+def _sample_readings(read_fn, n: int, delay_s: float) -> np.ndarray:
+    # Буфер выделяется сразу (float64, непрерывный) — статистика считается векторно.
+    # Пауза только МЕЖДУ отсчётами: после последнего ждать нечего.
+    xs = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        if i:
+            time.sleep(delay_s)
+        xs[i] = read_fn()
     return xs
 
-def verify_mainframe_output_voltage(k: K6430, dmm: HP3458A, cfg: ProcCfg) -> List[PointResult]:
+def _dmm_readings(dmm: HP3458A, cfg: ProcCfg) -> np.ndarray:
+    """Серия отсчётов эталона 3458A для одной точки."""
+    if cfg.burst:
+        # burst() отдаёт array('d') — ndarray поверх того же буфера, без копии
+        return np.frombuffer(dmm.burst(cfg.samples_per_point, cfg.nplc_3458, cfg.sample_delay_s),
+                             dtype=np.float64)
+    return _sample_readings(dmm.read, cfg.samples_per_point, cfg.sample_delay_s)
+
+def _dut_readings(k: K6430, cfg: ProcCfg) -> np.ndarray:
+    """Серия показаний DUT (6430) для одной точки."""
+    if cfg.burst:
+        return np.frombuffer(k.burst(cfg.samples_per_point, cfg.sample_delay_s), dtype=np.float64)
+    return _sample_readings(k.read, cfg.samples_per_point, cfg.sample_delay_s)
+
+# Колбэк на каждую готовую точку (например, запись строки CSV сразу на диск).
+OnPoint = Optional[Callable[[PointResult], None]]
+
+def _emit(results: List[PointResult], on_point: OnPoint, pr: PointResult) -> None:
+    """Добавить точку в результаты и сразу отдать её в on_point (если задан)."""
+    results.append(pr)
+    if on_point is not None:
+        on_point(pr)
+
+def _range_ordered(rows: List[LimitRow]) -> List[LimitRow]:
+    """Строки таблицы, сгруппированные по диапазону 3458A (устойчивая сортировка).
+
+    Перенастройка 3458A (last_range) тогда происходит только на границах групп,
+    а внутри группы точки идут в порядке таблицы.
+    """
+    return sorted(rows, key=lambda r: r.dmm_range)
+
+# Номинал резистора 5156 -> ключ standards_5156_actual_ohm в YAML.
+_R_KEYS = {100e6: "100M", 1e9: "1G", 10e9: "10G", 100e9: "100G"}
+
+def _r_key_from_nominal(R_nom: float) -> str:
+    """Ключ действительного значения R для номинала (или сам номинал строкой)."""
+    return _R_KEYS.get(float(R_nom), f"{R_nom:.3g}")
+
+# Строка low-current таблицы: (range, R_nom, I_nom, low, high).
+LowCurrentRow = Tuple[str, float, float, float, float]
+
+def _resistor_plan(rows: List[LowCurrentRow],
+                   r5156_actual: Dict[str, float] | None) -> Tuple[List[str], List[float]]:
+    """Ключи и действительные значения R (из YAML или номинал) для строк low-current таблицы."""
+    keys = [_r_key_from_nominal(row[1]) for row in rows]
+    R_act = [float((r5156_actual or {}).get(key, row[1])) for key, row in zip(keys, rows)]
+    return keys, R_act
+
+def _resistor_checklist(rows: List[LowCurrentRow], keys: List[str], R_act: List[float]) -> List[str]:
+    """Пункты чек-листа: один пункт на каждое подключение резистора 5156 (соседние строки
+    с тем же резистором объединяются)."""
+    items = []
+    for key, grp in groupby(range(len(keys)), key=keys.__getitem__):
+        idx = list(grp)
+        i = idx[0]
+        items.append(f"{key}: R_nom≈{rows[i][1]:.3g}Ω, R_act={R_act[i]:.6g}Ω — "
+                     + ", ".join(rows[j][0] for j in idx))
+    return items
+
+def _swap_resistor(key: str, R_act: float, current: str) -> str:
+    """Попросить переключить 5156 только если нужен другой резистор; вернуть текущий ключ."""
+    if key != current:
+        prompt(f"Переключи BNC shorting cap на джек 5156 {key} (R_act={R_act:.6g}Ω).")
+    return key
+
+# Пул для параллельного опроса 3458A и 6430 (разные GPIB-адреса, pyvisa
+# отпускает GIL на время ввода-вывода).
+_pool = ThreadPoolExecutor(max_workers=2)
+
+def _dmm_and_dut_readings(dmm: HP3458A, k: K6430, cfg: ProcCfg) -> Tuple[np.ndarray, np.ndarray]:
+    """Серии 3458A и 6430 на одной установившейся точке — одновременно.
+
+    3458A опрашивается в пуле, 6430 — в текущем потоке; время точки = max, а не сумма.
+    """
+    f_dmm = _pool.submit(_dmm_readings, dmm, cfg)
+    try:
+        dut = _dut_readings(k, cfg)
+        # ожидание 3458A — тоже под защитой: Ctrl+C чаще всего приходит именно здесь
+        return f_dmm.result(), dut
+    except BaseException:
+        # не оставляем 3458A посреди обмена (дальше будет safe_shutdown)
+        wait([f_dmm])
+        raise
+
+def _set_point(program: Callable[[], Optional[bool]], cfg: ProcCfg,
+               dmm_config: Optional[Callable[[], None]] = None) -> None:
+    """Установить точку на источнике и выждать стабилизацию.
+
+    program() задаёт значение (6430 source_v/source_i возвращают "сменился ли
+    диапазон", 5720A — None, пауза тогда полная). Если нужна перенастройка
+    3458A (dmm_config), она идёт в пуле параллельно с программированием
+    источника и паузой: к началу опроса 3458A уже на новом диапазоне.
+    """
+    f_cfg = _pool.submit(dmm_config) if dmm_config is not None else None
+    try:
+        changed = program()
+        _settle(cfg, changed is not False)
+        if f_cfg is not None:
+            f_cfg.result()
+    except BaseException:
+        # перенастройка 3458A должна закончиться до safe_shutdown
+        if f_cfg is not None:
+            wait([f_cfg])
+        raise
+
+def _point_result(test: str, row: LimitRow, actual: float, dmm_sd: float,
+                  dut_m: Optional[float] = None, dut_sd: Optional[float] = None) -> PointResult:
+    """Результат точки — считается сразу после её измерения (и сразу пишется в CSV).
+
+    actual — фактическое значение по эталону (на него переносятся лимиты, closest value).
+    С лимитами сравнивается dut_m (measure-таблицы) или, если его нет, actual (output).
+    """
+    lo, hi = shift_limits(row.set_value, row.low, row.high, actual)
+    checked = actual if dut_m is None else dut_m
+    return PointResult(
+        test=test,
+        range_name=row.range_name,
+        set_value=row.set_value,
+        actual_set=actual,
+        dmm_mean=actual, dmm_stdev=dmm_sd,
+        dut_mean=dut_m if dut_m is not None else float("nan"),
+        dut_stdev=dut_sd if dut_sd is not None else float("nan"),
+        low=lo, high=hi, unit=row.unit,
+        pass_fail="PASS" if within(checked, lo, hi) else "FAIL",
+    )
+
+def verify_mainframe_output_voltage(k: K6430, dmm: HP3458A, cfg: ProcCfg,
+        on_point: OnPoint = None) -> List[PointResult]:
     prompt("MAINFRAME output voltage accuracy (Table 18-3):\n"
            "Подключи 3458A к INPUT/OUTPUT HI/LO 6430 (Figure 18-2).\n"
            "На 6430: SOURCE V, OUTPUT ON. На 3458A: DCV.")
     results=[]
+    rows = _range_ordered(TABLE_18_3_MAINFRAME_OUT_V)
     k.output(True)
 
-    # Set 3458A range per point (0.120/1.2/12/120/1050 V)
+    # Set 3458A range per point (0.120/1.2/12/120/1050 V);
+    # reconfigure only when the required range changes
+    last_range: float | None = None
 
-    for row in TABLE_18_3_MAINFRAME_OUT_V:
-        # 3458A range: smallest that covers the point
-        dmm.config_dcv(row.set_value, cfg.nplc_3458)
+    for row in rows:
+        # 3458A range: smallest that covers the point (precomputed in LimitRow)
+        needed = row.dmm_range
+        reconf = partial(dmm.config_dcv, needed, cfg.nplc_3458) if needed != last_range else None
+        last_range = needed
 
-        # set nominal
-        k.source_v(row.set_value, rng=row.set_value*1.2 if row.set_value<200 else 200)
-        time.sleep(cfg.settle_s)
+        # set nominal (3458A range change overlaps with 6430 programming/settle)
+        _set_point(partial(k.source_v, row.set_value, rng=row.smu_range), cfg, reconf)
 
         # DMM reading of actual source
-        xs=_sample_readings(dmm.read, cfg.samples_per_point, cfg.sample_delay_s)
-        actual=mean(xs)
-
-        # Shift limits if actual differs (closest value)
-        lo, hi = shift_limits(row.set_value, row.low, row.high, actual)
-
-        passfail = "PASS" if within(actual, lo, hi) else "FAIL"
-        results.append(PointResult(
-            test="MF_OUT_V",
-            range_name=row.range_name,
-            set_value=row.set_value,
-            actual_set=actual,
-            dmm_mean=actual,
-            dmm_stdev=stdev(xs),
-            dut_mean=float("nan"),
-            dut_stdev=float("nan"),
-            low=lo, high=hi, unit=row.unit, pass_fail=passfail
-        ))
+        actual, xs_sd = mean_stdev(_dmm_readings(dmm, cfg))
+        # Shift limits to actual value (closest value), judge and emit the point
+        _emit(results, on_point, _point_result("MF_OUT_V", row, actual, xs_sd))
     k.output(False)
     return results
     
 
-def verify_mainframe_measure_voltage(k: K6430, dmm: HP3458A, src: Optional[Fluke5720A], cfg: ProcCfg) -> List[PointResult]:
+def verify_mainframe_measure_voltage(k: K6430, dmm: HP3458A, src: Optional[Fluke5720A], cfg: ProcCfg,
+        on_point: OnPoint = None) -> List[PointResult]:
     prompt("MAINFRAME voltage measurement accuracy (Table 18-4):\n"
            "Подключи 3458A к INPUT/OUTPUT HI/LO 6430 (Figure 18-2).\n"
            "На 6430: SOURCE V + MEAS V, OUTPUT ON. На 3458A: DCV.\n"
            "Если включено use_5720a_as_voltage_source=true, то источник будет 5720A (иначе 6430 сам).")
     results=[]
-    # 3458A range will be set per point
+    rows = _range_ordered(TABLE_18_4_MAINFRAME_MEAS_V)
+    # 3458A range will be set per point (only when it changes)
+    last_range: float | None = None
+    use_src = cfg.use_5720a_as_voltage_source and src is not None
     k.output(True)
-    if cfg.use_5720a_as_voltage_source and src is not None:
+    if use_src:
         src.operate()
+    # 6430 measures V in both modes: set once for the whole table
+    k.sense_func("VOLT")
+
+    for row in rows:
+        needed = row.dmm_range
+        reconf = partial(dmm.config_dcv, needed, cfg.nplc_3458) if needed != last_range else None
+        last_range = needed
 
-    for row in TABLE_18_4_MAINFRAME_MEAS_V:
-        if cfg.use_5720a_as_voltage_source and src is not None:
-            src.out_dcv(row.set_value)
-            time.sleep(cfg.settle_s)
-            xs=_sample_readings(dmm.read, cfg.samples_per_point, cfg.sample_delay_s)
-            actual=mean(xs)
-            # 6430 in MEAS V only:
-            k.sense_func("VOLT")
-            # read DUT
-            dut=_sample_readings(k.read, cfg.samples_per_point, cfg.sample_delay_s)
-            dut_m=mean(dut)
-            lo,hi=shift_limits(row.set_value,row.low,row.high,actual)
+        # source: 5720A or 6430 itself
+        if use_src:
+            _set_point(partial(src.out_dcv, row.set_value), cfg, reconf)
         else:
-            k.source_v(row.set_value, rng=row.set_value*1.2 if row.set_value<200 else 200)
-            k.sense_func("VOLT")
-            time.sleep(cfg.settle_s)
-            xs=_sample_readings(dmm.read, cfg.samples_per_point, cfg.sample_delay_s)
-            actual=mean(xs)
-            dut=_sample_readings(k.read, cfg.samples_per_point, cfg.sample_delay_s)
-            dut_m=mean(dut)
-            lo,hi=shift_limits(row.set_value,row.low,row.high,actual)
-
-        passfail="PASS" if within(dut_m, lo, hi) else "FAIL"
-        results.append(PointResult(
-            test="MF_MEAS_V",
-            range_name=row.range_name,
-            set_value=row.set_value,
-            actual_set=actual,
-            dmm_mean=actual,
-            dmm_stdev=stdev(xs),
-            dut_mean=dut_m,
-            dut_stdev=stdev(dut),
-            low=lo, high=hi, unit=row.unit, pass_fail=passfail
-        ))
-    if cfg.use_5720a_as_voltage_source and src is not None:
+            _set_point(partial(k.source_v, row.set_value, rng=row.smu_range), cfg, reconf)
+
+        # 3458A and DUT read the same settled point concurrently
+        xs, dut = _dmm_and_dut_readings(dmm, k, cfg)
+        actual, xs_sd = mean_stdev(xs)
+        dut_m, dut_sd = mean_stdev(dut)
+        _emit(results, on_point, _point_result("MF_MEAS_V", row, actual, xs_sd, dut_m, dut_sd))
+    if use_src:
         src.standby()
     k.output(False)
     return results
     
-def verify_mainframe_output_current(k: K6430, dmm: HP3458A, cfg: ProcCfg) -> List[PointResult]:
+def verify_mainframe_output_current(k: K6430, dmm: HP3458A, cfg: ProcCfg,
+        on_point: OnPoint = None) -> List[PointResult]:
     prompt("MAINFRAME output current accuracy (Table 18-5):\n"
            "Подключи 3458A (AMPS/INPUT LO) к INPUT/OUTPUT HI/LO 6430 (Figure 18-3).\n"
            "На 6430: SOURCE I, OUTPUT ON. На 3458A: DCI.")
     results=[]
-    # range on 3458A depends; set large
-    dmm.config_dci(row.set_value, cfg.nplc_3458)
+    rows = _range_ordered(TABLE_18_5_MAINFRAME_OUT_I)
+    # 3458A DCI range per point (only when it changes)
+    last_range: float | None = None
     k.output(True)
 
-    for row in TABLE_18_5_MAINFRAME_OUT_I:
-        k.source_i(row.set_value, rng=abs(row.set_value)*1.2)
-        time.sleep(cfg.settle_s)
-        xs=_sample_readings(dmm.read, cfg.samples_per_point, cfg.sample_delay_s)
-        actual=mean(xs)
-        lo,hi=shift_limits(row.set_value,row.low,row.high,actual)
-        passfail="PASS" if within(actual, lo, hi) else "FAIL"
-        results.append(PointResult(
-            test="MF_OUT_I",
-            range_name=row.range_name,
-            set_value=row.set_value,
-            actual_set=actual,
-            dmm_mean=actual, dmm_stdev=stdev(xs),
-            dut_mean=float("nan"), dut_stdev=float("nan"),
-            low=lo, high=hi, unit=row.unit, pass_fail=passfail
-        ))
+    for row in rows:
+        needed = row.dmm_range
+        reconf = partial(dmm.config_dci, needed, cfg.nplc_3458) if needed != last_range else None
+        last_range = needed
+        _set_point(partial(k.source_i, row.set_value, rng=row.smu_range), cfg, reconf)
+        actual, xs_sd = mean_stdev(_dmm_readings(dmm, cfg))
+        _emit(results, on_point, _point_result("MF_OUT_I", row, actual, xs_sd))
     return results
 
-def verify_mainframe_measure_current(k: K6430, dmm: HP3458A, cfg: ProcCfg) -> List[PointResult]:
+def verify_mainframe_measure_current(k: K6430, dmm: HP3458A, cfg: ProcCfg,
+        on_point: OnPoint = None) -> List[PointResult]:
     prompt("MAINFRAME current measurement accuracy (Table 18-6):\n"
            "Подключи 3458A (AMPS/INPUT LO) к INPUT/OUTPUT HI/LO 6430 (Figure 18-3).\n"
            "На 6430: SOURCE I + MEAS I, OUTPUT ON. На 3458A: DCI.")
     results=[]
-    dmm.config_dci(row.set_value, cfg.nplc_3458)
+    rows = _range_ordered(TABLE_18_6_MAINFRAME_MEAS_I)
+    # 3458A DCI range per point (only when it changes)
+    last_range: float | None = None
     k.output(True)
     k.sense_func("CURR")
 
-    for row in TABLE_18_6_MAINFRAME_MEAS_I:
-        k.source_i(row.set_value, rng=abs(row.set_value)*1.2)
-        time.sleep(cfg.settle_s)
-        xs=_sample_readings(dmm.read, cfg.samples_per_point, cfg.sample_delay_s)
-        actual=mean(xs)
-        dut=_sample_readings(k.read, cfg.samples_per_point, cfg.sample_delay_s)
-        dut_m=mean(dut)
-        lo,hi=shift_limits(row.set_value,row.low,row.high,actual)
-        passfail="PASS" if within(dut_m, lo, hi) else "FAIL"
-        results.append(PointResult(
-            test="MF_MEAS_I",
-            range_name=row.range_name,
-            set_value=row.set_value,
-            actual_set=actual,
-            dmm_mean=actual, dmm_stdev=stdev(xs),
-            dut_mean=dut_m, dut_stdev=stdev(dut),
-            low=lo, high=hi, unit=row.unit, pass_fail=passfail
-        ))
+    for row in rows:
+        needed = row.dmm_range
+        reconf = partial(dmm.config_dci, needed, cfg.nplc_3458) if needed != last_range else None
+        last_range = needed
+        _set_point(partial(k.source_i, row.set_value, rng=row.smu_range), cfg, reconf)
+        xs, dut = _dmm_and_dut_readings(dmm, k, cfg)
+        actual, xs_sd = mean_stdev(xs)
+        dut_m, dut_sd = mean_stdev(dut)
+        _emit(results, on_point, _point_result("MF_MEAS_I", row, actual, xs_sd, dut_m, dut_sd))
     k.output(False)
     return results
 
-def verify_remote_preamp_low_current_measurement(k: K6430, dmm: HP3458A, cfg: ProcCfg, r5156_actual: Dict[str, float] | None = None) -> List[PointResult]:
-    prompt("REMOTE PREAMP 1pA–100nA range MEASUREMENT accuracy (Table 18-13):\n"
+def verify_remote_preamp_low_current_measurement(k: K6430, dmm: HP3458A, cfg: ProcCfg, r5156_actual: Dict[str, float] | None = None,
+        on_point: OnPoint = None) -> List[PointResult]:
+    rows = TABLE_18_13_PREAMP_MEAS_I_LOW
+    keys, R_act = _resistor_plan(rows, r5156_actual)
+    prompt_checklist("REMOTE PREAMP 1pA–100nA range MEASUREMENT accuracy (Table 18-13):\n"
            "Подключения как Figure 18-7: 3458A измеряет напряжение на выходе 5156/резистора.\n"
-           "5156 и резисторы подключаются вручную. Скрипт будет просить переключать джек.\n"
-           "Алгоритм: измерить V на эталонном R, вычислить I=V/R, выставить I на 6430, проверить показание.")
+           "Алгоритм: измерить V на эталонном R, вычислить I=V/R, выставить I на 6430, проверить показание.\n"
+           "5156 и резисторы подключаются вручную, по порядку (скрипт напомнит при смене резистора).\n"
+           f"Перед началом подключи {keys[0]}:", _resistor_checklist(rows, keys, R_act))
     results=[]
     dmm.config_dcv(20.0, cfg.nplc_3458)
     k.output(True)
     k.sense_func("CURR")
 
-    for (rng, R_nom, I_nom, lo_nom, hi_nom) in TABLE_18_13_PREAMP_MEAS_I_LOW:
-        key = _r_key_from_nominal(R_nom)
-        R = float((r5156_actual or {}).get(key, R_nom))
-        prompt(f"Подключи BNC shorting cap к нужному джеку 5156 для {rng} (R_nom≈{R_nom:.3g}Ω, R_act={R:.6g}Ω).")
+    current = keys[0]
+    for (rng, R_nom, I_nom, lo_nom, hi_nom), key, R in zip(rows, keys, R_act):
+        current = _swap_resistor(key, R, current)
         # Measure V across resistor via DMM
-        xs=_sample_readings(dmm.read, cfg.samples_per_point, cfg.sample_delay_s)
-        V=mean(xs)
+        V, xs_sd = mean_stdev(_dmm_readings(dmm, cfg))
         I_calc = V / R
         # Set 6430 source current to calculated
-        k.source_i(I_calc, rng=abs(I_calc)*1.2)
-        time.sleep(cfg.settle_s)
+        changed = k.source_i(I_calc, rng=abs(I_calc)*1.2)
+        _settle(cfg, changed)
         # Read back source setpoint (closest value)
         try:
             I_set = k.source_i_query()
         except Exception:
             I_set = I_calc
+        dut_m, dut_sd = mean_stdev(_dut_readings(k, cfg))
+
         # shift limits from nominal current value (as in table) to actual setpoint
-        lo,hi=shift_limits(I_nom, lo_nom, hi_nom, I_set)
-        dut=_sample_readings(k.read, cfg.samples_per_point, cfg.sample_delay_s)
-        dut_m=mean(dut)
-        passfail="PASS" if within(dut_m, lo, hi) else "FAIL"
-        results.append(PointResult(
+        lo, hi = shift_limits(I_nom, lo_nom, hi_nom, I_set)
+        _emit(results, on_point, PointResult(
             test="PA_MEAS_I_LOW",
             r_key=key, r_nom_ohm=R_nom, r_act_ohm=R,
             range_name=rng,
             set_value=I_nom,
             actual_set=I_set,
-            dmm_mean=V, dmm_stdev=stdev(xs),
-            dut_mean=dut_m, dut_stdev=stdev(dut),
-            low=lo, high=hi, unit="A", pass_fail=passfail
+            dmm_mean=V, dmm_stdev=xs_sd,
+            dut_mean=dut_m, dut_stdev=dut_sd,
+            low=lo, high=hi, unit="A", pass_fail="PASS" if within(dut_m, lo, hi) else "FAIL"
         ))
     k.output(False)
     return results
 
-def verify_remote_preamp_low_current_output(k: K6430, dmm: HP3458A, cfg: ProcCfg, r5156_actual: Dict[str, float] | None = None) -> List[PointResult]:
-    prompt("REMOTE PREAMP 1pA–100nA range OUTPUT current accuracy (Table 18-11):\n"
+def verify_remote_preamp_low_current_output(k: K6430, dmm: HP3458A, cfg: ProcCfg, r5156_actual: Dict[str, float] | None = None,
+        on_point: OnPoint = None) -> List[PointResult]:
+    rows = TABLE_18_11_PREAMP_OUT_I_LOW
+    keys, R_act = _resistor_plan(rows, r5156_actual)
+    prompt_checklist("REMOTE PREAMP 1pA–100nA range OUTPUT current accuracy (Table 18-11):\n"
            "Подключения как Figure 18-7: 3458A измеряет напряжение на эталонном R (5156).\n"
-           "Алгоритм: задать I на 6430, измерить V, вычислить I=V/R, сравнить с лимитами.")
+           "Алгоритм: задать I на 6430, измерить V, вычислить I=V/R, сравнить с лимитами.\n"
+           "Резисторы 5156 по порядку (скрипт напомнит при смене резистора).\n"
+           f"Перед началом подключи {keys[0]}:", _resistor_checklist(rows, keys, R_act))
     results=[]
     dmm.config_dcv(20.0, cfg.nplc_3458)
     k.output(True)
 
-    for (rng, R_nom, I_nom, lo_nom, hi_nom) in TABLE_18_11_PREAMP_OUT_I_LOW:
-        key = _r_key_from_nominal(R_nom)
-        R = float((r5156_actual or {}).get(key, R_nom))
-        prompt(f"Подключи BNC shorting cap к нужному джеку 5156 для {rng} (R_nom≈{R_nom:.3g}Ω, R_act={R:.6g}Ω).")
-        k.source_i(I_nom, rng=abs(I_nom)*1.2)
-        time.sleep(cfg.settle_s)
-        xs=_sample_readings(dmm.read, cfg.samples_per_point, cfg.sample_delay_s)
-        V=mean(xs)
+    current = keys[0]
+    for (rng, R_nom, I_nom, lo_nom, hi_nom), key, R in zip(rows, keys, R_act):
+        current = _swap_resistor(key, R, current)
+        changed = k.source_i(I_nom, rng=abs(I_nom)*1.2)
+        _settle(cfg, changed)
+        xs=_dmm_readings(dmm, cfg)
+        V, _ = mean_stdev(xs)
         I_calc = V / R
         # actual setpoint
         try:
             I_set = k.source_i_query()
         except Exception:
             I_set = I_nom
-        lo,hi=shift_limits(I_nom, lo_nom, hi_nom, I_set)
-        passfail="PASS" if within(I_calc, lo, hi) else "FAIL"
-        results.append(PointResult(
+
+        # limits (closest value) and verdict for this point
+        lo, hi = shift_limits(I_nom, lo_nom, hi_nom, I_set)
+        _emit(results, on_point, PointResult(
             test="PA_OUT_I_LOW",
             r_key=key, r_nom_ohm=R_nom, r_act_ohm=R,
             range_name=rng,
@@ -280,7 +397,7 @@ def verify_remote_preamp_low_current_output(k: K6430, dmm: HP3458A, cfg: ProcCfg
             actual_set=I_set,
             dmm_mean=I_calc, dmm_stdev=0.0,
             dut_mean=float("nan"), dut_stdev=float("nan"),
-            low=lo, high=hi, unit="A", pass_fail=passfail
+            low=lo, high=hi, unit="A", pass_fail="PASS" if within(I_calc, lo, hi) else "FAIL"
         ))
     k.output(False)
     return results
@@ -13,17 +13,36 @@ from __future__ import annotations
 - set_value (номинал точки)
 - low/high (пределы допуска из мануала)
 - unit
+- dmm_range/smu_range (вычисляются при импорте из set_value и unit)
 
 Для low-current таблиц присутствует номинальное сопротивление R_nom.
 Действительное сопротивление R_act берётся из YAML и логируется отдельно.
 """
 
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from dataclasses import dataclass, field
+from typing import Any, Dict, Final, List, Optional, Tuple
+import bisect
 
 # Все таблицы раздела 18 (18-1 ... 18-16) забиты здесь как данные.
 # Значения извлечены из Keithley 6430 Reference Manual (Jan 2021) раздел 18.
 
+# Фиксированные диапазоны эталонного 3458A, по возрастанию (bisect ищет минимально достаточный).
+# Лежат здесь, а не в драйвере: модулю таблиц не нужен PyVISA; драйвер импортирует их отсюда.
+_DCV_RANGES: Final = (0.120, 1.2, 12.0, 120.0, 1050.0)
+_DCI_RANGES: Final = (120e-9, 1.2e-6, 12e-6, 120e-6, 1.2e-3, 12e-3, 120e-3, 1.05)
+
+def map_dcv_range(v_abs: float) -> float:
+    """Map requested DCV range/value to one of: 0.120, 1.2, 12, 120, 1050 V."""
+    i = bisect.bisect_left(_DCV_RANGES, abs(float(v_abs)))
+    return _DCV_RANGES[min(i, len(_DCV_RANGES) - 1)]
+
+def map_dci_range(i_abs: float) -> float:
+    """Map requested DCI range/value to one of:
+    120 nA, 1.2 uA, 12 uA, 120 uA, 1.2 mA, 12 mA, 120 mA, 1.05 A (returned in amperes).
+    """
+    i = bisect.bisect_left(_DCI_RANGES, abs(float(i_abs)))
+    return _DCI_RANGES[min(i, len(_DCI_RANGES) - 1)]
+
 @dataclass(frozen=True)
 class LimitRow:
     range_name: str
@@ -31,6 +50,24 @@ class LimitRow:
     low: float
     high: float
     unit: str
+    # Диапазоны приборов для точки — считаются один раз в __post_init__:
+    # dmm_range — диапазон 3458A (DCV/DCI), smu_range — диапазон источника 6430.
+    # Для сопротивлений (OHM) не используются: None.
+    dmm_range: Optional[float] = field(default=None, init=False, compare=False)
+    smu_range: Optional[float] = field(default=None, init=False, compare=False)
+
+    def __post_init__(self):
+        if self.unit == "V":
+            dmm = map_dcv_range(self.set_value)
+            smu = self.set_value*1.2 if self.set_value < 200 else 200
+        elif self.unit == "A":
+            dmm = map_dci_range(self.set_value)
+            smu = abs(self.set_value)*1.2
+        else:
+            return
+        # frozen=True: поля задаются в обход __setattr__
+        object.__setattr__(self, "dmm_range", dmm)
+        object.__setattr__(self, "smu_range", smu)
 
 def shift_limits(nominal: float, low: float, high: float, actual: float) -> tuple[float,float]:
     """'Closest value' пересчёт лимитов:
@@ -15,16 +15,18 @@ run_verification.py
 3) Делает reset() приборов.
 4) Выполняет процедуры из procedures/section18.py (Table 18-3, 18-4, ...).
 5) Сохраняет результаты в CSV:
-   - section18_<timestamp>.csv — результаты точек (PASS/FAIL, лимиты, измерения).
+   - section18_<timestamp>.csv — результаты точек (PASS/FAIL, лимиты, измерения),
+     пишется построчно по мере измерения (при Ctrl+C снятые точки сохраняются).
    - section18_<timestamp>_standards_5156.csv — какие R_act применялись (трассируемость).
 6) При любом завершении (успех / ошибка / Ctrl+C) выполняет safe_shutdown().
 
 Примечание по "closest value":
 В некоторых таблицах руководство разрешает не попадать точно в номинал.
 Тогда пределы допуска сдвигаются относительно фактического значения эталона.
-Эта логика реализована в procedures/section18.shift_limits().
+Эта логика реализована в procedures/tables_section18.shift_limits().
 """
-import argparse, yaml, pathlib, datetime
+import argparse, yaml, pathlib, datetime, csv
+from collections import Counter
 from drivers.visa_base import VisaConfig
 from drivers.k6430 import K6430
 from drivers.hp3458a import HP3458A
@@ -38,7 +40,7 @@ from procedures.section18 import (
     verify_remote_preamp_low_current_output,
     verify_remote_preamp_low_current_measurement,
 )
-from procedures.common import to_dataframe
+from procedures.common import CsvResultWriter
 from procedures.safety import safe_shutdown
 
 def main():
@@ -63,6 +65,9 @@ def main():
         samples_per_point=int(meas.get("samples_per_point")),
         sample_delay_s=float(meas.get("sample_delay_s")),
         use_5720a_as_voltage_source=bool(cfg.get("use_5720a_as_voltage_source")),
+        burst=bool(meas.get("burst", True)),
+        settle_s_same_range=(float(meas["settle_s_same_range"])
+                             if meas.get("settle_s_same_range") is not None else None),
     )
 
     r5156_actual = cfg.get("standards_5156_actual_ohm", {})
@@ -90,28 +95,30 @@ def main():
         dmm.reset()
         if src: src.reset()
 
-        results=[]
-        results += verify_mainframe_output_voltage(k,dmm,proc_cfg)
-        results += verify_mainframe_measure_voltage(k,dmm,src,proc_cfg)
-        results += verify_mainframe_output_current(k,dmm,proc_cfg)
-        results += verify_mainframe_measure_current(k,dmm,proc_cfg)
-        results += verify_remote_preamp_low_current_output(k,dmm,proc_cfg, r5156_actual)
-        results += verify_remote_preamp_low_current_measurement(k,dmm,proc_cfg, r5156_actual)
-
-        df=to_dataframe(results)
+        # Results are streamed to CSV point by point: Ctrl+C keeps partial data.
         csv_path=outdir/f"section18_{stamp}.csv"
-        df.to_csv(csv_path, index=False)
-        print("\nГотово:", csv_path)
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            on_point=CsvResultWriter(f)
+            results=[]
+            results += verify_mainframe_output_voltage(k,dmm,proc_cfg, on_point)
+            results += verify_mainframe_measure_voltage(k,dmm,src,proc_cfg, on_point)
+            results += verify_mainframe_output_current(k,dmm,proc_cfg, on_point)
+            results += verify_mainframe_measure_current(k,dmm,proc_cfg, on_point)
+            results += verify_remote_preamp_low_current_output(k,dmm,proc_cfg, r5156_actual, on_point)
+            results += verify_remote_preamp_low_current_measurement(k,dmm,proc_cfg, r5156_actual, on_point)
+
+        summary=Counter(r.pass_fail for r in results)
+        print(f"\nИтого точек: {len(results)} (PASS: {summary['PASS']}, FAIL: {summary['FAIL']})")
+        print("Готово:", csv_path)
 
         # Traceability: save applied 5156 actual resistors map
-        std_rows = []
-        for kkey, rval in (r5156_actual or {}).items():
-            std_rows.append({"standard": "Fluke5156A", "key": kkey, "R_act_ohm": float(rval)})
-        if std_rows:
-            import pandas as _pd
-            std_df = _pd.DataFrame(std_rows).sort_values("key")
+        if r5156_actual:
             std_csv = outdir / f"section18_{stamp}_standards_5156.csv"
-            std_df.to_csv(std_csv, index=False)
+            with open(std_csv, "w", newline="", encoding="utf-8") as f:
+                w = csv.writer(f, lineterminator="\n")
+                w.writerow(("standard", "key", "R_act_ohm"))
+                for kkey in sorted(r5156_actual):
+                    w.writerow(("Fluke5156A", kkey, float(r5156_actual[kkey])))
             print("Standards CSV:", std_csv)
 
     except KeyboardInterrupt: